@@ -1,38 +1,182 @@
+import functools
 import inspect
+import warnings
+import numpy as np
 import sympy as sym
+from sympy.printing.latex import LatexPrinter
+from sympy.utilities.autowrap import CodeWrapError, ufuncify
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import symengine
+except ImportError:
+    symengine = None
+
+
+def _create(cls, func):
+    error = object.__new__(cls)
+    error._setup(func)
+    return error
+
+
+# Bounded, so that functions which are no longer used, e.g. lambdas, are released eventually
+_build = functools.lru_cache(maxsize=128)(_create)
+
+
+# Functions whose derivatives symengine writes in the same form as sympy; others differ, e.g. acosh,
+# or crash symengine, e.g. Mod
+_SYMENGINE_FUNCTIONS = (
+    sym.sin, sym.cos, sym.tan, sym.cot, sym.sec, sym.csc,
+    sym.asin, sym.acos, sym.atan, sym.acot, sym.atan2,
+    sym.sinh, sym.cosh, sym.tanh, sym.coth, sym.asinh, sym.atanh, sym.acoth,
+    sym.exp, sym.log, sym.erf, sym.erfc, sym.gamma, sym.loggamma, sym.LambertW,
+)
+
+
+def _symengine_agrees(f):
+    # Powers are only differentiated alike for constant exponents, e.g. not x**y
+    for node in sym.preorder_traversal(f):
+        if node.is_Atom or isinstance(node, (sym.Add, sym.Mul) + _SYMENGINE_FUNCTIONS):
+            continue
+        if isinstance(node, sym.Pow) and node.exp.is_Number:
+            continue
+        return False
+    return True
+
+
+def _diff(f, f_fast, variable):
+    # Differentiate with symengine if the function could be converted, and convert back for printing
+    if f_fast is not None:
+        return sym.sympify(f_fast.diff(symengine.Symbol(str(variable))))
+    return f.diff(variable)
+
+
+class _SIPrinter(LatexPrinter):
+    # Prints the markers of substituted values with their units in siunitx notation
+    def __init__(self, values):
+        super().__init__({"mul_symbol": "dot"})
+        self.values = values
+
+    def _print_Dummy(self, expr):
+        if expr not in self.values:
+            return super()._print_Dummy(expr)
+        value, unit = self.values[expr]
+        if value == 0.0:
+            return "0"
+        if float(value).is_integer():
+            number = f"{int(value)}"
+        else:
+            number = f"{float(value)}"
+        if value < 0:
+            return "\\left(\\SI{" + number + "}{" + f"{unit}" + "}\\right)"
+        return "\\SI{" + number + "}{" + f"{unit}" + "}"
 
 
 class Error:
-    def __init__(self, func):
+    # Printer for the symbolic derivatives, shared instead of constructed by every sym.latex call
+    _latex = LatexPrinter().doprint
+
+    def __new__(cls, func):
+        # The symbolic work only depends on the function, so it is done once per function and the
+        # instances are shared; copying an instance returns the shared instance itself
+        try:
+            hash(func)
+        except TypeError:
+            # Unhashable callables cannot be cached
+            return _create(cls, func)
+        return _build(cls, func)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self.func,))
+
+    def _setup(self, func):
+        self.func = func
         # Get the arguments of the function
         arg_names = inspect.getfullargspec(func).args
         # Define the variables as regular Python variables
         self.variables = [sym.Symbol(name) for name in arg_names]
 
-        # Define the error symbols
-        self.error_symbols = ["delta_" + str(variable) for variable in self.variables]
+        # Define the error symbols alongside the variable names
+        self.error_info = [(str(variable), sym.Symbol("delta_" + str(variable))) for variable in self.variables]
+        # Look up the existing symbols by name instead of creating new ones for every substitution
+        self._sym_by_name = {str(variable): variable for variable in self.variables}
+        self._sym_by_name |= {delta_symbol.name: delta_symbol for _, delta_symbol in self.error_info}
 
         # Set the function
         self.f = func(*self.variables)
 
         # Calculate the derivatives and multiply by the errors
+        # Variables not occurring in the function have a vanishing derivative
         self.derivatives = {}
+        free_symbols = self.f.free_symbols
+        # symengine differentiates much faster than sympy, if it is available; it is only used where
+        # it gives the same derivatives, so that the output does not depend on whether it is installed
+        f_fast = None
+        if symengine is not None and _symengine_agrees(self.f):
+            try:
+                f_fast = symengine.sympify(self.f)
+            except symengine.SympifyError:
+                pass
         for variable in self.variables:
-            f_prime = self.f.diff(variable)
+            if variable in free_symbols:
+                f_prime = _diff(self.f, f_fast, variable)
+            else:
+                f_prime = sym.S.Zero
             self.derivatives[str(variable)] = f_prime
 
+        # Compiled lazily on the first numerical evaluation, so that derivatives which cannot be
+        # compiled, e.g. unevaluated ones of floor or Abs, can still be printed
+        self._derivatives_func = None
+
+        # Compile the whole error formula for vectorized evaluation of many data points. The values
+        # are real numbers; on plain symbols sympy would rewrite e.g. |exp(-y)| as exp(-re(y)),
+        # which cannot be compiled
+        real_variables = [sym.Symbol(str(variable), real=True) for variable in self.variables]
+        to_real = dict(zip(self.variables, real_variables))
+        delta_variables = [delta_symbol for _, delta_symbol in self.error_info]
+        self.error = sum(
+            [
+                delta_variable * sym.Abs(self.derivatives[str(variable)].xreplace(to_real))
+                for variable, delta_variable in zip(self.variables, delta_variables)
+            ],
+            sym.S.Zero,
+        )
+        self._error_args = real_variables + delta_variables
+        # Compiled lazily on the first batch evaluation
+        self._error_kernel = None
+
     def substitute(self, values):
         derivatives_sub = []
-        for variable in self.variables:
-            # Get the variable name as a string
-            variable_name = str(variable)
-            # Substitute the values for the variable and error symbol
-            derivative_sub = self.derivatives[variable_name].subs(
-                {key: sym.UnevaluatedExpr(value[0]) for key, value in values.items()}
-            )
+        # Substitute a marker for each value, so that the printer can tell the substituted values
+        # apart from numbers in the formula; the keys are plain symbols, so xreplace suffices
+        replacements = {}
+        markers = {}
+        for key, value in values.items():
+            if key in self._sym_by_name:
+                marker = sym.Dummy(key)
+                replacements[self._sym_by_name[key]] = marker
+                markers[marker] = value
+        printer = _SIPrinter(markers)
+        for variable_name, delta_symbol in self.error_info:
+            # Vanishing derivatives do not contribute to the error
+            if self.derivatives[variable_name].is_zero:
+                continue
+            # Substitute the values for the variable
+            derivative_sub = self.derivatives[variable_name].xreplace(replacements)
             # Format the substituted derivative as a string in LaTeX format
-            derivative_latex = sym.latex(derivative_sub)
-            derivative_str = f"{values['delta_'+variable_name][0]} \\cdot \\left|{derivative_latex}\\right|"
+            derivative_latex = printer.doprint(derivative_sub)
+            delta_latex = printer.doprint(replacements[delta_symbol])
+            derivative_str = f"{delta_latex} \\cdot \\left|{derivative_latex}\\right|"
             derivatives_sub.append(derivative_str)
         return " + ".join(derivatives_sub)
 
@@ -42,45 +186,78 @@ class Error:
             "    &= \\Delta "
             + " + \\Delta ".join(
                 [
-                    f"{delta_name} \\cdot \\left|{sym.latex(derivative)}\\right|"
+                    f"{delta_name} \\cdot \\left|{self._latex(derivative)}\\right|"
                     for delta_name, derivative in self.derivatives.items()
+                    if not derivative.is_zero
                 ]
             )
             + "\\\\\n"
         )
         substituted_str = self.substitute(values)
-        for value in values.values():
-            if value[0] == 0.0:
-                continue
-            if int(value[0]) == float(value[0]):
-                substituted_str = substituted_str.replace(
-                    f"{value[0]}", "\\SI{" + f"{int(value[0])}" + "}{" + f"{value[1]}" + "}"
-                )
-            else:
-                substituted_str = substituted_str.replace(
-                    f"{value[0]}", "\\SI{" + f"{float(value[0])}" + "}{" + f"{value[1]}" + "}"
-                )
         latex_str += f"    &= {substituted_str}\\\\\n"
         # Calculate the result using the substituted values
-        result = sum(
-            [
-                values[delta_name][0]
-                * abs(self.derivatives[delta_name.split("_")[1]].subs({k: v[0] for k, v in values.items()}))
-                for delta_name in self.error_symbols
-            ]
-        )
-        latex_str += f"    &= \\SI{{{float(result)}}}{{}}\n"
+        latex_str += f"    &= \\SI{{{float(self.result(values))}}}{{}}\n"
         latex_str += "\\end{align*}\n\n"
         return latex_str
     def result(self, values):
+        # Compile all derivatives into one plain Python function for the numerical evaluation;
+        # common subexpressions of the derivatives are evaluated only once
+        if self._derivatives_func is None:
+            self._derivatives_func = sym.lambdify(
+                self.variables, list(self.derivatives.values()), "math", cse=True
+            )
+        args = [values[str(variable)][0] for variable in self.variables]
+        try:
+            derivatives = self._derivatives_func(*args)
+        except (ValueError, ZeroDivisionError):
+            # The math module only handles real, finite values, e.g. not sqrt(-4) or 1/0, so those
+            # are evaluated symbolically
+            replacements = {variable: sym.sympify(arg) for variable, arg in zip(self.variables, args)}
+            derivatives = [derivative.xreplace(replacements).evalf() for derivative in self.derivatives.values()]
         result = sum(
             [
-                values[delta_name][0]
-                * abs(self.derivatives[delta_name.split("_")[1]].subs({k: v[0] for k, v in values.items()}))
-                for delta_name in self.error_symbols
+                values[delta_symbol.name][0] * abs(derivative)
+                for (_, delta_symbol), derivative, symbolic in zip(
+                    self.error_info, derivatives, self.derivatives.values()
+                )
+                if not symbolic.is_zero
             ]
         )
         return result
+
+    def _compile_error_kernel(self):
+        # Fuse the error formula into a single parallel ufunc with numba, if it is available
+        if numba is not None:
+            error_func = sym.lambdify(self._error_args, self.error, "math", cse=True)
+            signature = numba.float64(*[numba.float64] * len(self._error_args))
+            try:
+                return numba.vectorize([signature], target="parallel")(error_func)
+            except (numba.core.errors.NumbaError, TypeError) as error:
+                warnings.warn(f"numba could not compile the error formula: {error}", RuntimeWarning)
+        # Otherwise compile it to a C extension, falling back to numpy if there is no compiler
+        try:
+            return ufuncify(self._error_args, self.error)
+        except (CodeWrapError, ImportError, OSError) as error:
+            warnings.warn(f"autowrap could not compile the error formula: {error}", RuntimeWarning)
+            return sym.lambdify(self._error_args, self.error, "numpy", cse=True)
+
+    def evaluate_batch(self, values_array):
+        # Each row holds the values of the variables followed by their errors, in argument order
+        columns = np.ascontiguousarray(np.transpose(values_array), dtype=float)
+        if self._error_kernel is None:
+            self._error_kernel = self._compile_error_kernel()
+        return self._error_kernel(*columns)
+
+    def batch_result(self, values):
+        # The values may be arrays, which are broadcast against each other. The first call compiles
+        # the kernel, which without numba runs a C compiler and takes a noticeable fraction of a second
+        args = [np.asarray(values[str(variable)][0], dtype=float) for variable in self.variables]
+        args += [np.asarray(values[delta_symbol.name][0], dtype=float) for _, delta_symbol in self.error_info]
+        if self._error_kernel is None:
+            self._error_kernel = self._compile_error_kernel()
+        result = self._error_kernel(*args)
+        return np.broadcast_to(result, np.broadcast(*args).shape).copy()
+
     def __str__(self):
         derivatives_str = " + ".join(
             [
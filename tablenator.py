@@ -7,8 +7,8 @@ class Table:
 	
 	Attributes
 	----------
-	data : Union[List[List[int]], np.ndarray[float][int]]
-		Contains the table entries in a nested list.
+	data : np.ndarray[float][int]
+		Contains the table entries in a two-dimensional array.
 	rowlabels : List[str], default=None
 		Contains names of the table rows.
 	collabels : List[str], default=None
@@ -18,7 +18,7 @@ class Table:
 	label : str, default=None
 		The label used for cross-referencing the table environment in LaTeX.
 	precision : Union[int, List[int]], default=None
-		The amount of decimal characters of the table entries. Numbers with greater precision are rounded and numbers with less precision are filled with ending zeros. 'None' keeps the amount of decimals as in the original nested list.
+		The amount of decimal characters of the table entries. Numbers with greater precision are rounded and numbers with less precision are filled with ending zeros. 'None' keeps the amount of decimals as in 'data'. The precision stays with its entries when the table is transposed.
 	booktabs : bool, default=True
 		Whether the booktabs package is used in LaTeX. If True, top-, mid- and bottomrules are used instead of hlines.
 	decimal : str, default='{,}'
@@ -87,6 +87,8 @@ class Table:
 		self.caption = None
 		self.label = None
 		self.precision = None
+		self._precision = None
+		self._integer = None
 		self.booktabs = True
 		self.decimal = '{,}'
 		self.position = 'htbp'
@@ -105,41 +107,44 @@ class Table:
 		Raises
 		------
 		TypeError : If input is not of type List[List[float]] or np.ndarray[float]
-		ValueError : If input is not 2-dimensional
+		ValueError : If input is not 2-dimensional or its rows differ in length
 		'''
 		# First case: type(data) = List[List[float]]
 		if isinstance(data, list):
-			for row in data:
-				if isinstance(row, list):
-					if all(isinstance(val, float) or isinstance(val, int) for val in row):
-						continue
-					else:
-						raise TypeError("'data' must only contain floats")
-				else:
-					raise TypeError("'data' must be a list of lists")
-			self.data = data
+			if not all(isinstance(row, list) for row in data):
+				raise TypeError("'data' must be a list of lists")
+			# Let numpy check the entries; numpy rejects rows of different lengths
+			try:
+				array = np.array(data)
+			except ValueError:
+				raise ValueError(
+					f"Row length mismatch. Expected {len(data[0])} entries in every row."
+					) from None
+			# Columns of integers keep printing as integers, even if other columns contain floats
+			integer = [np.asarray(column).dtype.kind in 'iu' for column in zip(*data)]
+			data = array
 	
 		# Second case: type(data) = np.array
 		elif isinstance(data, np.ndarray):
-			# Remove axes of length one from labels
-			data = np.squeeze(data)
-			# Iterate over all entries; use .item() to convert 0-dimensional arrays to numbers
-			if all(isinstance(val.item(), float) or isinstance(val.item(), int) for val in np.nditer(data)):
-				# Check if data is two-dimensional
-				if data.ndim == 2:
-					# Convert to list
-					data = data.tolist()
-					self.data = data
-				else:
-					raise ValueError(
-						f"Data dimension mismatch. Expected 2, but got {data.ndim}."
-						)
-			else:
-				raise TypeError("'data' must only contain floats")
+			# Remove axes of length one from labels; the copy keeps later changes of the input out of the table
+			data = np.array(np.squeeze(data))
+			integer = data.dtype.kind in 'iu'
 		
 		# Third case: Wrong type
 		else:		
 			raise TypeError("'data' must be a list of lists")
+
+		# Check the type of all entries at once via the dtype of the array
+		if data.dtype.kind not in 'biuf':
+			raise TypeError("'data' must only contain floats")
+		# Check if data is two-dimensional
+		if data.ndim != 2:
+			raise ValueError(
+				f"Data dimension mismatch. Expected 2, but got {data.ndim}."
+				)
+		self.data = data
+		# One kind per column, transposed along with the data
+		self._integer = np.broadcast_to(integer, (1, data.shape[1])).copy()
 		
 	def set_rowlabels(self, labels: List[str]):
 		'''Set the names of the table rows.
@@ -254,23 +259,21 @@ class Table:
 		Raises
 		------
 		TypeError : If input is not of type int or List[int]
-		ValueError : If number of column labels does not match number of columns in data
+		ValueError : If number of entries in 'precision' does not match number of columns in data
 		'''
 		# Check if precision is an integer
 		if isinstance(precision, int):
 			self.precision = precision
-			for i, row in enumerate(self.data):
-				self.data[i]=["%.*f" % (self.precision,round(x,self.precision)) for x in row]
 		elif isinstance(precision, list) and all(isinstance(prec, int) for prec in precision):
-			if not len(precision) == len(self.data):
+			if not len(precision) == self.data.shape[1]:
 				raise ValueError(
-					f"Number of entries in 'precision' does not match number of columns in data. Expected {len(self.data)}, but got {len(precision)}."
+					f"Number of entries in 'precision' does not match number of columns in data. Expected {self.data.shape[1]}, but got {len(precision)}."
 					)
 			self.precision = precision
-			for i, row in enumerate(self.data):
-				self.data[i]=["%.*f" % (self.precision[i],round(x,self.precision[i])) for x in row]
 		else:
 			raise TypeError(f"'precision' must be an integer or a list of integers")
+		# One precision per column; the entries are only formatted when generating the table
+		self._precision = np.asarray(self.precision, dtype=int).reshape(1, -1)
 
 	def set_decimal(self, sep: str):
 		'''Configure the decimal separator.
@@ -343,71 +346,102 @@ class Table:
 		else:
 			raise TypeError("'change_labels' must be a bool")
 		
-		self.data = [list(x) for x in zip(*self.data)]
+		self.data = self.data.T
+		self._integer = self._integer.T
+		# The precision stays with the entries it was set for
+		if self._precision is not None:
+			self._precision = self._precision.T
+
+	def _format(self):
+		'''Returns the table entries as strings'''
+		if self._precision is None:
+			formatted = self.data.astype(str)
+			# Integers stored as floats alongside float columns are printed without a decimal place
+			integers = np.broadcast_to(self._integer, self.data.shape)
+			if integers.any():
+				formatted[integers] = np.char.mod("%d", self.data[integers])
+			return formatted
+		data = self.data.astype(float)
+		precisions = np.broadcast_to(self._precision, data.shape)
+		formatted = np.empty(data.shape, dtype=object)
+		# Format all entries with the same precision at once
+		for prec in np.unique(precisions):
+			entries = precisions == prec
+			values = data[entries]
+			# String formatting only rounds to decimal places
+			if prec < 0:
+				values = np.round(values, prec)
+			formatted[entries] = np.char.mod(f"%.{max(prec, 0)}f", values)
+		return formatted
 
 	def _toprule(self):
-		'''Adds the toprule to the table'''
+		'''Returns the toprule of the table'''
 		if self.booktabs:
-			self.table += "\t\\toprule\n\t"
+			return "\t\\toprule\n\t"
 		else:
-			self.table += "\t\\hline\n\t"
+			return "\t\\hline\n\t"
 
 	def _midrule(self):
-		'''Adds the midrule to the table'''
+		'''Returns the midrule of the table'''
 		if self.booktabs:
-			self.table += "\t\\midrule\n\t"
+			return "\t\\midrule\n\t"
 		else:
-			self.table += "\t\\hline\n\t"
+			return "\t\\hline\n\t"
 
 	def _bottomrule(self):
-		'''Adds the bottomrule to the table'''
+		'''Returns the bottomrule of the table'''
 		if self.booktabs:
-			self.table += "\\bottomrule\n\t"
+			return "\\bottomrule\n\t"
 		else:
-			self.table += "\\hline\n\t"
+			return "\\hline\n\t"
 
 	def generate(self):
 		'''Generate the table.'''
+		# Collect the parts of the table and join them once at the end
+		parts = []
 		# Begin table environment
-		self.table = "\\begin{table}" + f"[{self.position}]\n"
+		parts.append("\\begin{table}" + f"[{self.position}]\n")
 		# Center table within table environment
-		self.table += "\t\\centering\n"
+		parts.append("\t\\centering\n")
 		# Add caption if necessary
 		if self.caption != None:
-			self.table += "\t\\caption{" + self.caption + "}\n"
+			parts.append("\t\\caption{" + self.caption + "}\n")
 		# Begin LaTeX table
-		self.table += "\t\\begin{tabular}{"
+		parts.append("\t\\begin{tabular}{")
+		collabels = self.collabels
 		# Add column for row labels (if any)
 		if self.rowlabels:
-			self.table += "l|"
-			if self.collabels:
-				self.collabels.insert(0,'')
+			parts.append("l|")
+			if collabels:
+				collabels = [''] + collabels
 		# Add column specification for data columns
-		self.table += "c" * len(self.data[0]) + "}\n"
+		parts.append("c" * self.data.shape[1] + "}\n")
 		# Add horizontal line above top row
-		self._toprule()
+		parts.append(self._toprule())
 		# Add column labels (if any)
-		if self.collabels:
-			self.table += " & ".join(self.collabels) + " \\\\\n"
+		if collabels:
+			parts.append(" & ".join(collabels) + " \\\\\n")
 			# Add horizontal line below column labels
-			self._midrule()
+			parts.append(self._midrule())
+		# Translation table replacing dots with the decimal separator
+		decimal = str.maketrans({'.': self.decimal})
 		# Add rows with data and row labels (if any)
-		for i, row in enumerate(self.data):
+		for i, row in enumerate(self._format().tolist()):
 			# Add row labels (if any)
 			if self.rowlabels:
-				self.table += self.rowlabels[i] + " & "
-			row=[str(x) for x in row]
-			# Replace dots with decimal separator and add rows with data
-			self.table += " & ".join(x.replace('.',self.decimal) for x in row) + " \\\\\n\t"
+				parts.append(self.rowlabels[i] + " & ")
+			# Replace dots with decimal separator in the whole row at once and add rows with data
+			parts.append(" & ".join(row).translate(decimal) + " \\\\\n\t")
 		# Add horizontal line below bottom row
-		self._bottomrule()
+		parts.append(self._bottomrule())
 		# End LaTeX table
-		self.table += "\\end{tabular}\n"
+		parts.append("\\end{tabular}\n")
 		# Add label if necessary
 		if self.label != None:
-			self.table += "\t\\label{tab:" + self.label + "}\n"
+			parts.append("\t\\label{tab:" + self.label + "}\n")
 		# End table environment
-		self.table += "\\end{table}"
+		parts.append("\\end{table}")
+		self.table = "".join(parts)
 
 	def save(self, path: str):
 		'''Save the table as a file.
@@ -1,4 +1,11 @@
+import copy
+import functools
+import pickle
+import warnings
+
 import errorcalc
+import numpy as np
+import sympy as sym
 
 def my_function1(a, b):
     return a + a * b ** 3
@@ -14,3 +21,96 @@ derivatives = errorcalc.Error(my_function1)
 error = derivatives.result(values1)
 latex_out = derivatives.latex_out(values1)
 assert error == 9.6
+
+values2 = dict(values1, b=([2, 3], ''))
+errors = derivatives.batch_result(values2)
+assert errors[0] == 9.6
+assert errors[1] == derivatives.result(dict(values1, b=(3, '')))
+
+assert errorcalc.Error(my_function1) is derivatives
+
+assert "\\SI{0.4}{\\volt} \\cdot \\left|\\SI{2}{}^{3} + 1\\right|" in latex_out
+
+# Numbers in the formula are not mistaken for substituted values
+literal_error = errorcalc.Error(lambda x, y: x / y - 0.5 * x)
+literal_values = {"x": (2, ''), "y": (0.5, ''), "delta_x": (0.1, ''), "delta_y": (0.5, '')}
+assert "\\left|-0.5 + \\frac{1}{\\SI{0.5}{}}\\right|" in literal_error.substitute(literal_values)
+
+errors = derivatives.evaluate_batch([[1, 2, 0.4, 0.5], [1, 3, 0.4, 0.5]])
+assert np.allclose(errors, derivatives.batch_result(values2))
+
+# Derivatives that cannot be compiled may still be built and printed
+floor_error = errorcalc.Error(lambda x, y: sym.floor(x) * y)
+assert str(floor_error) == "delta_x*(y*Derivative(floor(x), x)) + delta_y*(floor(x))"
+
+# symengine must not be used for functions it only wraps, as differentiating them crashes it
+mod_error = errorcalc.Error(lambda x, y: sym.Mod(x, 3) * y)
+assert mod_error.derivatives["y"] == sym.Mod(sym.Symbol("x"), 3)
+
+# The function is built evaluated, so the derivatives do not depend on the differentiation backend
+log_error = errorcalc.Error(lambda x, y: sym.exp(sym.log(x)) * y)
+assert log_error.derivatives["y"] == sym.Symbol("x")
+
+# Without numba the batch kernel is compiled by autowrap
+numba = errorcalc.numba
+errorcalc.numba = None
+derivatives._error_kernel = None
+errors = derivatives.batch_result(values2)
+assert isinstance(derivatives._error_kernel, np.ufunc)
+assert np.allclose(errors, [derivatives.result(values1), derivatives.result(dict(values1, b=(3, '')))])
+errorcalc.numba = numba
+derivatives._error_kernel = None
+
+# Instances are shared, also when copied
+assert copy.copy(derivatives) is derivatives
+assert copy.deepcopy(derivatives) is derivatives
+assert pickle.loads(pickle.dumps(derivatives)) is derivatives
+
+
+class UnhashablePartial(functools.partial):
+    def __eq__(self, other):
+        return self is other
+
+
+# Unhashable callables are not cached
+unhashable_error = errorcalc.Error(UnhashablePartial(my_function1))
+assert str(unhashable_error) == str(derivatives)
+
+# The error formula is built on real variables, so absolute values of exp terms simplify
+exp_error = errorcalc.Error(lambda x, y: x * sym.exp(-y))
+assert not exp_error.error.has(sym.re, sym.im)
+exp_values = {"x": (2, ''), "y": (0.5, ''), "delta_x": (0.1, ''), "delta_y": (0.2, '')}
+assert np.isclose(exp_error.batch_result(exp_values), exp_error.result(exp_values))
+
+# numba compiles formulas with exp and erf instead of falling back to numpy
+if errorcalc.numba is not None:
+    erf_error = errorcalc.Error(lambda x, y: x * sym.erf(y))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert np.isclose(erf_error.batch_result(exp_values), erf_error.result(exp_values))
+        assert np.isclose(exp_error.batch_result(exp_values), exp_error.result(exp_values))
+
+# autowrap also compiles formulas with exp
+errorcalc.numba = None
+exp_error._error_kernel = None
+assert np.isclose(exp_error.batch_result(exp_values), exp_error.result(exp_values))
+assert isinstance(exp_error._error_kernel, np.ufunc)
+errorcalc.numba = numba
+exp_error._error_kernel = None
+
+# Values outside the real domain of the math module are evaluated symbolically
+root_error = errorcalc.Error(lambda x, y: sym.sqrt(x) * y)
+root_values = {"x": (-4, ""), "y": (3, ""), "delta_x": (0.1, ""), "delta_y": (0.2, "")}
+assert np.isclose(float(root_error.result(root_values)), 0.475)
+assert "\\SI{0.475" in root_error.latex_out(root_values)
+pole_error = errorcalc.Error(lambda x, y: y / x)
+pole_values = {"x": (0, ""), "y": (3, ""), "delta_x": (0.1, ""), "delta_y": (0.2, "")}
+assert pole_error.result(pole_values) == sym.oo
+assert "\\SI{inf}{}" in pole_error.latex_out(pole_values)
+
+# The derivatives do not depend on whether symengine is installed, e.g. of acosh or of powers
+acosh_error = errorcalc.Error(lambda x, y: sym.acosh(x) * y)
+x, y = sym.symbols("x y")
+assert acosh_error.derivatives["x"] == y / (sym.sqrt(x - 1) * sym.sqrt(x + 1))
+power_error = errorcalc.Error(lambda x, y: x**y)
+assert power_error.derivatives["x"] == (x**y).diff(x)
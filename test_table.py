@@ -0,0 +1,52 @@
+import numpy as np
+
+import tablenator as tn
+
+# Rows of different lengths are rejected
+try:
+    tn.Table([[1, 2], [3]])
+except ValueError as error:
+    assert str(error) == "Row length mismatch. Expected 2 entries in every row."
+else:
+    raise AssertionError("ragged rows were accepted")
+
+# A list of precisions applies per column, as in the example of the class docstring
+x = tn.Table(np.array(((1, 9.3), (3.01, 4.83))))
+x.transpose()
+x.set_precision([1, 2])
+x.generate()
+assert "\t1{,}0 & 3{,}01 \\\\\n\t9{,}3 & 4{,}83 \\\\\n" in x.table
+
+# Generating a table repeatedly does not change the column labels
+x = tn.Table([[1, 9], [3, 4]])
+x.set_collabels(['a', 'b'])
+x.set_rowlabels(['erste Zeile', 'zweite Zeile'])
+x.generate()
+first = x.table
+x.generate()
+assert x.table == first
+assert x.collabels == ['a', 'b']
+assert "\t & a & b \\\\\n" in x.table
+
+# Columns of integers are printed as integers next to columns of floats
+x = tn.Table([[1, 9.25], [3, 4]])
+x.generate()
+assert "\t1 & 9{,}25 \\\\\n\t3 & 4{,}0 \\\\\n" in x.table
+x.transpose()
+x.generate()
+assert "\t1 & 3 \\\\\n\t9{,}25 & 4{,}0 \\\\\n" in x.table
+
+# The table copies its data instead of keeping a view of the input
+data = np.array([[1.5, 2.5], [3.5, 4.5]])
+x = tn.Table(data)
+data[0, 0] = 0
+x.generate()
+assert "\t1{,}5 & 2{,}5 \\\\\n" in x.table
+
+# A precision set before transposing stays with its entries
+x = tn.Table([[1.234, 9.876], [3.14159, 4.5]])
+x.set_precision([1, 2])
+x.transpose()
+x.set_decimal('.')
+x.generate()
+assert "\t1.2 & 3.1 \\\\\n\t9.88 & 4.50 \\\\\n" in x.table